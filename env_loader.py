@@ -1,8 +1,26 @@
 import os
 import sys
+import functools
 from pathlib import Path
 from dotenv import load_dotenv
 
+@functools.lru_cache(maxsize=1)
+def load_env_file():
+    """
+    Quietly load the first .env file found into the environment.
+    
+    The current directory is checked before the user's home directory. The
+    lookup only runs once per process; later calls return the cached result.
+    
+    Returns:
+        pathlib.Path: The .env file that was loaded, or None if there was none
+    """
+    for env_path in (Path('.env'), Path.home() / '.env'):
+        if env_path.is_file():
+            load_dotenv(env_path)
+            return env_path
+    return None
+
 def load_environment():
     """
     Load environment variables from .env file.
@@ -12,17 +30,14 @@ def load_environment():
     2. .env file in current directory
     3. .env file in user's home directory
     """
-    # Try loading from current directory
-    if os.path.exists('.env'):
-        load_dotenv('.env')
+    env_path = load_env_file()
+    
+    if env_path == Path('.env'):
         print("Loaded API key from .env file in current directory")
         return True
     
-    # Try loading from home directory
-    home_env = os.path.join(str(Path.home()), '.env')
-    if os.path.exists(home_env):
-        load_dotenv(home_env)
-        print(f"Loaded API key from {home_env}")
+    if env_path is not None:
+        print(f"Loaded API key from {env_path}")
         return True
     
     # Check if the API key is already set in the environment
@@ -1,14 +1,179 @@
 import os
+import copy
 import json
+import math
+import asyncio
 import argparse
-import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
-from pymatgen.ext.matproj import MPRester
-from pymatgen.core import Composition
-from pymatgen.analysis.phase_diagram import PhaseDiagram, PDPlotter
+import functools
+import itertools
+import operator
+import queue
+import threading
+import time
+from collections import OrderedDict
+from enum import Enum
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+import joblib
+import numpy as np
+from requests.adapters import HTTPAdapter
 from tabulate import tabulate
-from mp_api.client import MPRester
+from env_loader import load_env_file
+
+
+# Root of the on-disk query cache; one subdirectory per MP data release
+CACHE_DIR = Path(os.environ.get('MRAG_CACHE_DIR', Path.home() / '.mrag_cache')).expanduser()
+
+# Number of query results kept in memory per aggregator
+LRU_CACHE_SIZE = 128
+
+# Bumped whenever the shape of cached query results changes
+CACHE_SCHEMA_VERSION = 2
+
+# How long the recorded MP database release is trusted before re-checking
+RELEASE_TTL_SECONDS = 24 * 60 * 60
+
+# Maximum number of material IDs fetched per compare_materials query
+COMPARE_PAGE_SIZE = 100
+
+# Maximum number of documents requested per page; matches mp_api's own default
+SEARCH_PAGE_SIZE = 1000
+
+
+# Columns shown in the CLI tables; fetched by default unless --full is passed
+DISPLAY_FIELDS = [
+    "material_id",
+    "formula_pretty",
+    "formation_energy_per_atom",
+    "energy_above_hull",
+    "band_gap"
+]
+
+# Column dtypes for numeric properties; everything else is stored as object
+_DTYPES = {
+    "formation_energy_per_atom": "float64",
+    "energy_above_hull": "float64",
+    "band_gap": "float64",
+    "density": "float64",
+    "total_magnetization": "float64",
+    "e_electronic": "float64",
+}
+
+
+def _call_fetch(key, fetch):
+    """Run a deferred query. Wrapped by joblib so results are cached by key."""
+    return fetch()
+
+
+def _allocate_columns(n, properties):
+    """Preallocate one column of length n per property, typed via _DTYPES."""
+    return {prop: np.empty(n, dtype=_DTYPES.get(prop, object)) for prop in properties}
+
+
+def _docs_to_columns(docs, properties):
+    """
+    Read the requested attributes of API documents into preallocated columns.
+    
+    Attributes are read directly from each document rather than serializing
+    the whole document to a dictionary first.
+    
+    Args:
+        docs (list): Documents returned by the MP API
+        properties (list): Properties to extract; dotted paths are allowed
+        
+    Returns:
+        dict: Mapping of property name to NumPy column
+    """
+    columns = _allocate_columns(len(docs), properties)
+    if not docs:
+        return columns
+    
+    getter = operator.attrgetter(*properties)
+    
+    for i, doc in enumerate(docs):
+        try:
+            values = getter(doc)
+        except AttributeError:
+            # A nested path crossed a missing sub-document
+            values = tuple(
+                functools.reduce(lambda obj, attr: getattr(obj, attr, None), prop.split("."), doc)
+                for prop in properties
+            )
+        if len(properties) == 1:
+            values = (values,)
+        
+        # Pair by name: columns is keyed per unique property, values is not
+        for prop, value in zip(properties, values):
+            column = columns[prop]
+            if value is None and column.dtype != object:
+                value = np.nan
+            column[i] = value
+    
+    return columns
+
+
+def _concat_columns(page_columns, properties):
+    """Join per-page columns (as returned by _docs_to_columns) into one set."""
+    if not page_columns:
+        return _allocate_columns(0, properties)
+    return {
+        prop: np.concatenate([page[prop] for page in page_columns])
+        for prop in properties
+    }
+
+
+def _top_level_fields(properties):
+    """
+    Map requested properties to the top-level document fields the API accepts.
+    
+    Dotted properties (e.g. "symmetry.symbol") are fetched via their parent
+    field and read from the returned sub-document.
+    """
+    return list(dict.fromkeys(prop.split(".", 1)[0] for prop in properties))
+
+
+def _export_value(value, nested):
+    """
+    Convert a single cell to a value pyarrow can write.
+    
+    Enum members are replaced by their value. When nested is False, container
+    values (e.g. the bulk_modulus dict) are written as their string form, as
+    pandas would.
+    """
+    if isinstance(value, Enum):
+        return value.value
+    if not nested and isinstance(value, (dict, list, tuple)):
+        return str(value)
+    return value
+
+
+def _to_arrow_table(df, nested):
+    """
+    Build a pyarrow Table from a DataFrame of API results.
+    
+    Only object columns holding something other than plain strings are
+    converted, so typical string and numeric columns go to pyarrow untouched.
+    
+    Args:
+        df (pandas.DataFrame): Data to convert
+        nested (bool): Keep dict/list values as nested Arrow types (Parquet)
+                    rather than writing them as strings (CSV)
+        
+    Returns:
+        pyarrow.Table: Converted data
+    """
+    import pandas as pd
+    import pyarrow as pa
+    
+    converted = {
+        name: col.map(lambda value: _export_value(value, nested))
+        for name, col in df.items()
+        if col.dtype == object and pd.api.types.infer_dtype(col, skipna=True) not in ('string', 'empty')
+    }
+    if converted:
+        df = df.assign(**converted)
+    
+    return pa.Table.from_pandas(df, preserve_index=False)
 
 
 class MaterialsResearchAggregator:
@@ -17,29 +182,24 @@ class MaterialsResearchAggregator:
     from the Materials Project database.
     """
     
-    def __init__(self, api_key=None):
+    def __init__(self, api_key=None, use_cache=True):
         """
         Initialize the Materials Research Aggregator.
         
         Args:
             api_key (str): Materials Project API key. If None, will try to use
                         the MATERIALS_PROJECT_API_KEY environment variable.
+            use_cache (bool): Cache query results in memory and on disk
         """
         if api_key is None:
             api_key = os.environ.get('MATERIALS_PROJECT_API_KEY')
             
             if api_key is None:
                 try:
-                    env_path = os.path.join(os.getcwd(), '.env')
-                    if os.path.exists(env_path):
-                        with open(env_path, 'r') as f:
-                            for line in f:
-                                if line.startswith('MATERIALS_PROJECT_API_KEY='):
-                                    api_key = line.strip().split('=', 1)[1]
-                                    api_key = api_key.strip("'").strip('"')
-                                    break
+                    load_env_file()
                 except Exception as e:
                     print(f"Error reading .env file: {e}")
+                api_key = os.environ.get('MATERIALS_PROJECT_API_KEY')
                     
             if api_key is None:
                 raise ValueError(
@@ -47,9 +207,229 @@ class MaterialsResearchAggregator:
                     "MATERIALS_PROJECT_API_KEY environment variable or create a .env file."
                 )
         
-        self.mpr = MPRester(api_key)
+        # The MP client is created on first use (see the mpr property)
+        self._api_key = api_key
+        self._mpr = None
+        self._mpr_lock = threading.Lock()
+        
+        # Shared worker pool for running blocking MP queries concurrently
+        self._pool = ThreadPoolExecutor(max_workers=16)
+        
+        self.use_cache = use_cache
+        self._lru = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._disk_fetch = None
+        self._phase_diagrams = {}
 
 
+    @property
+    def mpr(self):
+        """
+        Materials Project API client, created on first use.
+        
+        Deferring construction keeps --help and argument errors off the network.
+        """
+        with self._mpr_lock:
+            if self._mpr is None:
+                # mp_api pulls in pymatgen's plotting stack, so import it on demand
+                from mp_api.client import MPRester
+                
+                mpr = MPRester(self._api_key)
+                self._configure_session(mpr)
+                self._mpr = mpr
+        return self._mpr
+
+    def _configure_session(self, mpr):
+        """
+        Size the connection pool of the HTTP session shared by all MP queries.
+        
+        mp_api already reuses one keep-alive session, but its adapter keeps at
+        most 10 connections per host, fewer than the worker pool can have in
+        flight. The adapter is replaced by a larger one that keeps mp_api's
+        retry policy, so the user's MPRESTER_MAX_RETRIES/backoff settings
+        still apply.
+        
+        Args:
+            mpr (MPRester): Client whose session should be configured
+        """
+        session = getattr(mpr, "session", None) or getattr(mpr, "_session", None)
+        if session is None:
+            return
+        
+        retry = session.get_adapter("https://").max_retries
+        session.mount("https://", HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=retry))
+
+    def _cached_query(self, method, criteria, properties, fetch, memory_tier=True):
+        """
+        Return the result of an idempotent MP query, caching it by its inputs.
+        
+        Results are kept in an in-process LRU and in a joblib disk cache that
+        is versioned by the MP database release, so stale data is not served
+        once a new release has been detected. If the release can't be
+        determined, only the in-process tier is used.
+        
+        Args:
+            method (str): Name of the calling query method
+            criteria (dict): Query criteria
+            properties (list): Requested properties, or None
+            fetch (callable): Zero-argument function performing the query
+            memory_tier (bool): Also keep the result in the in-process LRU.
+                        Disable for large results the caller caches itself.
+            
+        Returns:
+            Result of fetch(), possibly loaded from cache
+        """
+        if not self.use_cache:
+            return fetch()
+        
+        key = (
+            CACHE_SCHEMA_VERSION,
+            method,
+            json.dumps(criteria, sort_keys=True, default=str),
+            json.dumps(sorted(properties or []))
+        )
+        
+        with self._lru_lock:
+            if memory_tier and key in self._lru:
+                self._lru.move_to_end(key)
+                # Callers may modify the result, so never hand out the cached object
+                return copy.deepcopy(self._lru[key])
+            disk_fetch = self._disk_fetch
+        
+        # Set up the disk tier and run the query outside the lock so concurrent
+        # misses don't serialize behind each other
+        if disk_fetch is None:
+            release = self._database_release()
+            if release is None:
+                # Without a known release there is no safe way to expire entries
+                disk_fetch = _call_fetch
+            else:
+                memory = joblib.Memory(CACHE_DIR / release, verbose=0)
+                disk_fetch = memory.cache(_call_fetch, ignore=['fetch'])
+            self._disk_fetch = disk_fetch
+        
+        result = disk_fetch(key, fetch)
+        if not memory_tier:
+            # Freshly fetched or unpickled, so nothing else holds a reference
+            return result
+        
+        with self._lru_lock:
+            self._lru[key] = result
+            if len(self._lru) > LRU_CACHE_SIZE:
+                self._lru.popitem(last=False)
+        
+        return copy.deepcopy(result)
+
+    def _database_release(self):
+        """
+        Return the current MP database release, used to version the disk cache.
+        
+        The release is recorded under CACHE_DIR and only re-checked against the
+        API once it is older than RELEASE_TTL_SECONDS, so cache hits don't pay a
+        network round-trip.
+        
+        Returns:
+            str: Database release, or None if it could not be determined
+        """
+        release_file = CACHE_DIR / 'release.json'
+        
+        try:
+            recorded = json.loads(release_file.read_text())
+            if time.time() - recorded['checked'] < RELEASE_TTL_SECONDS:
+                return recorded['release']
+        except (OSError, ValueError, KeyError, TypeError):
+            pass
+        
+        try:
+            # Read from the API heartbeat when the client is created
+            release = self.mpr.db_version
+        except Exception:
+            return None
+        if not release:
+            return None
+        
+        try:
+            CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            release_file.write_text(json.dumps({'release': release, 'checked': time.time()}))
+        except OSError:
+            pass
+        
+        return release
+
+    def _paged_search(self, fetch_page, pages, process, page_size=None):
+        """
+        Fetch and process pages of results, prefetching the next page.
+        
+        The first page is fetched inline. If more pages follow, a worker thread
+        fetches page N+1 while the caller processes page N, overlapping network
+        waits with deserialization. At most two fetched pages are buffered at a
+        time.
+        
+        Args:
+            fetch_page (callable): Function returning the results for one page
+            pages (iterable): Page arguments, passed to fetch_page in order
+            process (callable): Function applied to each page's results
+            page_size (int): If given, stop after the first page returning
+                        fewer results than this
+            
+        Returns:
+            list: Result of process for each page, in order
+        """
+        done = object()
+        pages = iter(pages)
+        
+        def is_last(results):
+            return page_size is not None and len(results) < page_size
+        
+        page = next(pages, done)
+        if page is done:
+            return []
+        results = fetch_page(page)
+        
+        page = done if is_last(results) else next(pages, done)
+        if page is done:
+            # Nothing to overlap with
+            return [process(results)]
+        
+        buffer = queue.Queue(maxsize=2)
+        stop = threading.Event()
+        
+        def put(item):
+            # Give up once the consumer has stopped, rather than blocking forever
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+        
+        def produce(page):
+            try:
+                while page is not done:
+                    page_results = fetch_page(page)
+                    if not put((page_results, None)):
+                        return
+                    page = done if is_last(page_results) else next(pages, done)
+            except Exception as e:
+                put((None, e))
+                return
+            put((done, None))
+        
+        threading.Thread(target=produce, args=(page,), daemon=True).start()
+        
+        try:
+            processed = [process(results)]
+            while True:
+                results, error = buffer.get()
+                if error is not None:
+                    raise error
+                if results is done:
+                    return processed
+                processed.append(process(results))
+        finally:
+            stop.set()
+
     def search_materials(self, elements, properties=None, num_results=10):
         """
         Search for materials containing specific elements using the MP API.
@@ -62,6 +442,27 @@ class MaterialsResearchAggregator:
         Returns:
             pandas.DataFrame: Materials data
         """
+        import pandas as pd
+        
+        columns = self.search_materials_columns(elements, properties, num_results)
+        
+        # Convert to DataFrame
+        df = pd.DataFrame(columns, copy=False)
+        
+        return df
+
+    def search_materials_columns(self, elements, properties=None, num_results=10):
+        """
+        Search for materials like search_materials, without building a DataFrame.
+        
+        Args:
+            elements (list): List of element symbols to search for
+            properties (list): List of properties to retrieve (default: None)
+            num_results (int): Maximum number of results to return
+            
+        Returns:
+            dict: Mapping of property name to column of values
+        """
 
         if properties is None:
             properties = [
@@ -81,19 +482,45 @@ class MaterialsResearchAggregator:
         # Create a chemsys string (e.g., "Li-Fe-O")
         chemsys = "-".join(elements)
         
-        # Fetch data using the API with correct field names
-        docs = self.mpr.materials.summary.search(
-            chemsys=chemsys,
-            fields=properties
-        )
+        if num_results < 1:
+            return _allocate_columns(0, properties)
         
-        # Convert documents to dictionaries and limit results
-        results = [doc.dict() for doc in docs][:num_results]
+        def fetch():
+            # Let the server sort and truncate so only num_results docs are sent
+            chunk_size = min(num_results, SEARCH_PAGE_SIZE)
+            docs = self.mpr.materials.summary.search(
+                chemsys=chemsys,
+                fields=_top_level_fields(properties),
+                num_chunks=math.ceil(num_results / chunk_size),
+                chunk_size=chunk_size,
+                _sort_fields="energy_above_hull"
+            )
+            
+            return _docs_to_columns(docs[:num_results], properties)
         
-        # Convert to DataFrame
-        df = pd.DataFrame(results)
+        return self._cached_query(
+            'search_materials',
+            {'chemsys': chemsys, 'num_results': num_results},
+            properties,
+            fetch
+        )
+
+    async def search_materials_async(self, elements, properties=None, num_results=10):
+        """
+        Asynchronous variant of search_materials, run on the shared worker pool.
         
-        return df
+        Args:
+            elements (list): List of element symbols to search for
+            properties (list): List of properties to retrieve (default: None)
+            num_results (int): Maximum number of results to return
+            
+        Returns:
+            pandas.DataFrame: Materials data
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, self.search_materials, elements, properties, num_results
+        )
 
     def get_phase_diagram(self, elements):
         """
@@ -105,8 +532,30 @@ class MaterialsResearchAggregator:
         Returns:
             tuple: (PhaseDiagram object, PDPlotter object)
         """
-        entries = self.mpr.get_entries_in_chemsys(elements)
-        pd_obj = PhaseDiagram(entries)
+        from monty.json import MontyDecoder
+        from pymatgen.analysis.phase_diagram import PhaseDiagram, PDPlotter
+        
+        key = tuple(sorted(elements))
+        pd_obj = self._phase_diagrams.get(key) if self.use_cache else None
+        
+        if pd_obj is None:
+            # Entries are cached as plain dicts so the disk cache doesn't depend
+            # on pickling pymatgen objects. _phase_diagrams already serves
+            # repeat calls, so they are only cached on disk.
+            entry_dicts = self._cached_query(
+                'get_entries_in_chemsys',
+                {'elements': list(key)},
+                None,
+                lambda: [entry.as_dict() for entry in self.mpr.get_entries_in_chemsys(elements)],
+                memory_tier=False
+            )
+            decoder = MontyDecoder()
+            entries = [decoder.process_decoded(d) for d in entry_dicts]
+            
+            pd_obj = PhaseDiagram(entries)
+            if self.use_cache:
+                self._phase_diagrams[key] = pd_obj
+        
         plotter = PDPlotter(pd_obj, show_unstable=True)
         return pd_obj, plotter
     
@@ -122,14 +571,23 @@ class MaterialsResearchAggregator:
         Returns:
             matplotlib.figure.Figure: Plot of the property trends
         """
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+        
         # Create a new figure
         fig, ax = plt.subplots(figsize=(10, 6))
         
         # Create a scatter plot
         sns.scatterplot(data=df, x=property_x, y=property_y, ax=ax)
         
-        # Calculate and display correlation
-        correlation = df[property_x].corr(df[property_y])
+        # Calculate and display correlation over rows where both values exist
+        x = df[property_x].to_numpy(dtype=np.float64)
+        y = df[property_y].to_numpy(dtype=np.float64)
+        mask = ~(np.isnan(x) | np.isnan(y))
+        if mask.sum() > 1:
+            correlation = np.corrcoef(x[mask], y[mask])[0, 1]
+        else:
+            correlation = np.nan
         ax.set_title(f'Correlation: {correlation:.2f}')
         
         # Add labels and grid
@@ -150,35 +608,83 @@ class MaterialsResearchAggregator:
         Returns:
             pandas.DataFrame: Comparison data
         """
+        import pandas as pd
+        
         if properties is None:
             properties = [
                 "material_id",
-                "formula",
+                "formula_pretty",
                 "formation_energy_per_atom",
                 "energy_above_hull",
                 "band_gap",
                 "density",
-                "elasticity.K_VRH",
-                "elasticity.G_VRH"
+                "bulk_modulus",
+                "shear_modulus"
             ]
+        elif "material_id" not in properties:
+            # Needed to put the rows back in the requested order
+            properties = ["material_id", *properties]
+        
+        def fetch_page(page):
+            # Fetch a whole page of materials in one request instead of one per ID
+            return self.mpr.materials.summary.search(
+                material_ids=page,
+                fields=_top_level_fields(properties)
+            )
         
-        # Get data for each material
-        data = []
-        for mid in material_ids:
-            material_data = self.mpr.query({"material_id": mid}, properties)[0]
+        # Fetch each material once, even if it was requested more than once
+        unique_ids = list(dict.fromkeys(material_ids))
+        
+        def fetch():
+            pages = [
+                unique_ids[i:i + COMPARE_PAGE_SIZE]
+                for i in range(0, len(unique_ids), COMPARE_PAGE_SIZE)
+            ]
             
-            # Handle nested properties
-            for prop in properties:
-                if "." in prop:
-                    base, nested = prop.split(".", 1)
-                    if base in material_data and isinstance(material_data[base], dict):
-                        material_data[prop] = material_data[base].get(nested)
+            # Unpack each page into typed columns while the next one downloads
+            page_columns = self._paged_search(
+                fetch_page,
+                pages,
+                lambda docs: _docs_to_columns(docs, properties)
+            )
             
-            data.append(material_data)
+            return _concat_columns(page_columns, properties)
         
-        return pd.DataFrame(data)
+        columns = self._cached_query(
+            'compare_materials',
+            {'material_ids': unique_ids},
+            properties,
+            fetch
+        )
+        
+        df = pd.DataFrame(columns, copy=False)
+        if df.empty:
+            return df
+        
+        # Preserve the order in which the IDs were requested
+        return df.set_index("material_id").reindex(material_ids).reset_index()
+    
+    async def compare_materials_async(self, material_ids, properties=None):
+        """
+        Asynchronous variant of compare_materials.
+        
+        Runs the comparison query on the shared worker pool so it can be
+        awaited alongside other requests.
+        
+        Args:
+            material_ids (list): List of material IDs
+            properties (list): List of properties to compare (default: None)
+            
+        Returns:
+            pandas.DataFrame: Comparison data
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool, self.compare_materials, material_ids, properties
+        )
     
-    def find_stable_materials(self, elements, energy_above_hull_max=0.05, band_gap_min=None):
+    def find_stable_materials(self, elements, energy_above_hull_max=0.05, band_gap_min=None,
+                              properties=None):
         """
         Find thermodynamically stable materials containing specific elements.
         
@@ -186,55 +692,173 @@ class MaterialsResearchAggregator:
             elements (list): List of element symbols
             energy_above_hull_max (float): Maximum energy above hull (eV/atom)
             band_gap_min (float): Minimum band gap (eV), or None to ignore
+            properties (list): List of properties to retrieve (default: None)
             
         Returns:
             pandas.DataFrame: Stable materials data
         """
+        import pandas as pd
+        
+        columns = self.find_stable_materials_columns(
+            elements,
+            energy_above_hull_max=energy_above_hull_max,
+            band_gap_min=band_gap_min,
+            properties=properties
+        )
+        df = pd.DataFrame(columns, copy=False)
+        
+        return df
+    
+    def find_stable_materials_columns(self, elements, energy_above_hull_max=0.05, band_gap_min=None,
+                                      properties=None):
+        """
+        Find stable materials like find_stable_materials, without building a DataFrame.
+        
+        Args:
+            elements (list): List of element symbols
+            energy_above_hull_max (float): Maximum energy above hull (eV/atom)
+            band_gap_min (float): Minimum band gap (eV), or None to ignore
+            properties (list): List of properties to retrieve (default: None)
+            
+        Returns:
+            dict: Mapping of property name to column of values
+        """
 
         criteria = {
-            "elements": {"$all": elements},
-            "energy_above_hull": {"$lte": energy_above_hull_max}
+            "elements": elements,
+            "energy_above_hull": (None, energy_above_hull_max)
         }
         
         if band_gap_min is not None:
-            criteria["band_gap"] = {"$gte": band_gap_min}
-        
-        properties = [
-            "material_id",
-            "formula",
-            "formation_energy_per_atom",
-            "energy_above_hull",
-            "band_gap",
-            "density",
-            "elasticity.K_VRH",
-            "spacegroup.symbol"
-        ]
-        
-        results = self.mpr.query(criteria, properties)
-        df = pd.DataFrame(results)
-        
-        if "spacegroup.symbol" in df.columns:
-            df["spacegroup"] = df["spacegroup"].apply(lambda x: x.get("symbol") if x else None)
-        
-        for col in df.columns:
-            if "." in col:
-                base, nested = col.split(".", 1)
-                if base in df.columns and isinstance(df[base].iloc[0], dict):
-                    df[col] = df[base].apply(lambda x: x.get(nested) if x else None)
+            criteria["band_gap"] = (band_gap_min, None)
         
-        return df
+        if properties is None:
+            properties = [
+                "material_id",
+                "formula_pretty",
+                "formation_energy_per_atom",
+                "energy_above_hull",
+                "band_gap",
+                "density",
+                "bulk_modulus",
+                "symmetry.symbol"
+            ]
+        
+        def fetch_page(page):
+            return self.mpr.materials.summary.search(
+                fields=_top_level_fields(properties),
+                _page=page,
+                chunk_size=SEARCH_PAGE_SIZE,
+                num_chunks=1,
+                **criteria
+            )
+        
+        def fetch():
+            # The number of matches isn't known up front, so keep requesting
+            # pages until a short one comes back, unpacking each into typed
+            # columns while the next one downloads
+            page_columns = self._paged_search(
+                fetch_page,
+                itertools.count(1),
+                lambda docs: _docs_to_columns(docs, properties),
+                page_size=SEARCH_PAGE_SIZE
+            )
+            return _concat_columns(page_columns, properties)
+        
+        return self._cached_query(
+            'find_stable_materials',
+            criteria,
+            properties,
+            fetch
+        )
+    
+    async def find_stable_materials_async(self, elements, energy_above_hull_max=0.05, band_gap_min=None,
+                                          properties=None):
+        """
+        Asynchronous variant of find_stable_materials, run on the shared worker pool.
+        
+        Args:
+            elements (list): List of element symbols
+            energy_above_hull_max (float): Maximum energy above hull (eV/atom)
+            band_gap_min (float): Minimum band gap (eV), or None to ignore
+            properties (list): List of properties to retrieve (default: None)
+            
+        Returns:
+            pandas.DataFrame: Stable materials data
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._pool,
+            functools.partial(
+                self.find_stable_materials,
+                elements,
+                energy_above_hull_max=energy_above_hull_max,
+                band_gap_min=band_gap_min,
+                properties=properties
+            )
+        )
     
-    def export_to_csv(self, df, filename):
+    def export_to_csv(self, df, filename, fmt=None):
         """
-        Export dataframe to CSV file.
+        Export dataframe to a CSV or Parquet file.
+        
+        CSV files are written with pyarrow's multi-threaded writer when it is
+        available, falling back to pandas otherwise. Enum values are written as
+        their value, and nested values (e.g. bulk_modulus) are kept as structs
+        in Parquet and written as strings in CSV.
         
         Args:
             df (pandas.DataFrame): Data to export
             filename (str): Output filename
+            fmt (str): "csv" or "parquet"; inferred from the filename if None
         """
-        df.to_csv(filename, index=False)
+        if fmt is None:
+            fmt = 'parquet' if filename.endswith('.parquet') else 'csv'
+        
+        if fmt == 'parquet':
+            import pyarrow.parquet as pq
+            
+            pq.write_table(_to_arrow_table(df, nested=True), filename, compression='zstd')
+        else:
+            try:
+                import pyarrow.csv as pa_csv
+            except ImportError:
+                df.to_csv(filename, index=False)
+            else:
+                pa_csv.write_csv(_to_arrow_table(df, nested=False), filename)
+        
         print(f"Data exported to {filename}")
     
+    def get_material_summary(self, material_id):
+        """
+        Retrieve the full summary document of a specific material.
+        
+        Args:
+            material_id (str): Material Project ID
+            
+        Returns:
+            dict: Material data
+        """
+        return self._cached_query(
+            'display_material_summary',
+            {'material_id': material_id},
+            None,
+            lambda: self.mpr.materials.summary.get_data_by_id(material_id).dict()
+        )
+    
+    async def get_material_summary_async(self, material_id):
+        """
+        Asynchronous variant of get_material_summary, run on the shared worker pool.
+        
+        Args:
+            material_id (str): Material Project ID
+            
+        Returns:
+            dict: Material data
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._pool, self.get_material_summary, material_id)
+    
     def display_material_summary(self, material_id):
         """
         Display a detailed summary of a specific material.
@@ -246,8 +870,7 @@ class MaterialsResearchAggregator:
             dict: Material data
         """
         try:
-            material_doc = self.mpr.materials.summary.get_data_by_id(material_id)
-            material_data = material_doc.dict()
+            material_data = self.get_material_summary(material_id)
             
             print("\n" + "="*50)
             print(f"Material ID: {material_id}")
@@ -285,38 +908,134 @@ class MaterialsResearchAggregator:
             return None
 
 
+async def _run_batch(aggregator, tasks, concurrency=8):
+    """
+    Run a list of batch tasks concurrently.
+    
+    At most `concurrency` tasks talk to the Materials Project at once to stay
+    within the API rate limit.
+    
+    Args:
+        aggregator (MaterialsResearchAggregator): Aggregator to run tasks on
+        tasks (list): Task dictionaries, each with a "command" key
+        concurrency (int): Maximum number of tasks in flight
+        
+    Returns:
+        list: One DataFrame or exception per task, in task order
+    """
+    sem = asyncio.Semaphore(concurrency)
+    
+    async def run(task):
+        async with sem:
+            command = task.get('command')
+            if command == 'search':
+                elements = [e.strip() for e in task['elements'].split(',')]
+                return await aggregator.search_materials_async(
+                    elements, task.get('properties'), task.get('limit', 10)
+                )
+            elif command == 'compare':
+                material_ids = [mid.strip() for mid in task['material_ids'].split(',')]
+                return await aggregator.compare_materials_async(material_ids, task.get('properties'))
+            elif command == 'stable':
+                elements = [e.strip() for e in task['elements'].split(',')]
+                return await aggregator.find_stable_materials_async(
+                    elements,
+                    energy_above_hull_max=task.get('hull', 0.05),
+                    band_gap_min=task.get('band_gap'),
+                    properties=task.get('properties')
+                )
+            elif command == 'summary':
+                import pandas as pd
+                
+                material_data = await aggregator.get_material_summary_async(task['material_id'])
+                return pd.json_normalize([material_data], sep=".")
+            raise ValueError(f"Unknown batch command: {command}")
+    
+    return await asyncio.gather(*(run(task) for task in tasks), return_exceptions=True)
+
+
+def _requested_fields(args):
+    """
+    Work out which properties a CLI command should fetch.
+    
+    Args:
+        args (argparse.Namespace): Parsed command-line arguments
+        
+    Returns:
+        list: Properties to fetch, or None for the method's full default set
+    """
+    if args.fields:
+        return list(dict.fromkeys(f.strip() for f in args.fields.split(',')))
+    if args.full or args.output:
+        return None
+    return list(DISPLAY_FIELDS)
+
+
+def _print_table(columns, fields):
+    """
+    Print the requested fields as a table.
+    
+    Args:
+        columns (dict or pandas.DataFrame): Column data keyed by property name
+        fields (list): Properties to show, or None for DISPLAY_FIELDS
+    """
+    shown = [c for c in fields or DISPLAY_FIELDS if c in columns]
+    print(tabulate({c: columns[c] for c in shown}, headers='keys', tablefmt='psql', showindex=True))
+
+
 def main():
     
     parser = argparse.ArgumentParser(description='Materials Research Aggregator')
+    parser.add_argument('--no-cache', action='store_true', help='Bypass the query result cache')
     subparsers = parser.add_subparsers(dest='command', help='Command to run')
     
     # Search command
     search_parser = subparsers.add_parser('search', help='Search for materials')
     search_parser.add_argument('elements', type=str, help='Comma-separated list of elements')
     search_parser.add_argument('--limit', type=int, default=10, help='Maximum number of results')
-    search_parser.add_argument('--output', type=str, help='Output CSV filename')
+    search_parser.add_argument('--output', type=str, help='Output CSV or Parquet filename')
+    search_parser.add_argument('--format', choices=['csv', 'parquet'],
+                               help='Output file format (default: inferred from filename)')
+    search_parser.add_argument('--fields', type=str, help='Comma-separated list of properties to fetch')
+    search_parser.add_argument('--full', action='store_true', help='Fetch the full default property set')
     
     # Compare command
     compare_parser = subparsers.add_parser('compare', help='Compare materials')
     compare_parser.add_argument('material_ids', type=str, help='Comma-separated list of material IDs')
-    compare_parser.add_argument('--output', type=str, help='Output CSV filename')
+    compare_parser.add_argument('--output', type=str, help='Output CSV or Parquet filename')
+    compare_parser.add_argument('--format', choices=['csv', 'parquet'],
+                               help='Output file format (default: inferred from filename)')
+    compare_parser.add_argument('--fields', type=str, help='Comma-separated list of properties to fetch')
+    compare_parser.add_argument('--full', action='store_true', help='Fetch the full default property set')
     
     # Stable command
     stable_parser = subparsers.add_parser('stable', help='Find stable materials')
     stable_parser.add_argument('elements', type=str, help='Comma-separated list of elements')
     stable_parser.add_argument('--hull', type=float, default=0.05, help='Maximum energy above hull')
     stable_parser.add_argument('--band-gap', type=float, help='Minimum band gap')
-    stable_parser.add_argument('--output', type=str, help='Output CSV filename')
+    stable_parser.add_argument('--output', type=str, help='Output CSV or Parquet filename')
+    stable_parser.add_argument('--format', choices=['csv', 'parquet'],
+                               help='Output file format (default: inferred from filename)')
+    stable_parser.add_argument('--fields', type=str, help='Comma-separated list of properties to fetch')
+    stable_parser.add_argument('--full', action='store_true', help='Fetch the full default property set')
     
     # Summary command
     summary_parser = subparsers.add_parser('summary', help='Show material summary')
     summary_parser.add_argument('material_id', type=str, help='Material ID')
     
+    # Batch command
+    batch_parser = subparsers.add_parser('batch', help='Run a JSON plan of commands concurrently')
+    batch_parser.add_argument('plan', type=str, help='JSON file containing a list of tasks')
+    
     args = parser.parse_args()
     
+    if args.command is None:
+        parser.print_help()
+        return
+    
     # Initialize the aggregator
     try:
-        aggregator = MaterialsResearchAggregator()
+        aggregator = MaterialsResearchAggregator(use_cache=not args.no_cache)
     except ValueError as e:
         print(f"Error: {e}")
         print("Please set your Materials Project API key using the environment variable:")
@@ -325,46 +1044,81 @@ def main():
     
     if args.command == 'search':
         elements = [e.strip() for e in args.elements.split(',')]
-        df = aggregator.search_materials(elements, num_results=args.limit)
+        fields = _requested_fields(args)
+        columns = aggregator.search_materials_columns(elements, properties=fields, num_results=args.limit)
+        count = len(next(iter(columns.values()), []))
         
-        print(f"\nFound {len(df)} materials containing {', '.join(elements)}:")
+        print(f"\nFound {count} materials containing {', '.join(elements)}:")
 
-        print(tabulate(df[['material_id', 'formula_pretty', 'formation_energy_per_atom', 
-                         'energy_above_hull', 'band_gap']], 
-                       headers='keys', tablefmt='psql'))
+        _print_table(columns, fields)
         
         if args.output:
-            aggregator.export_to_csv(df, args.output)
+            import pandas as pd
+            
+            aggregator.export_to_csv(pd.DataFrame(columns, copy=False), args.output, args.format)
     
     elif args.command == 'compare':
         material_ids = [mid.strip() for mid in args.material_ids.split(',')]
-        df = aggregator.compare_materials(material_ids)
+        df = aggregator.compare_materials(material_ids, properties=_requested_fields(args))
         
         print("\nMaterial Comparison:")
         print(tabulate(df, headers='keys', tablefmt='psql'))
         
         if args.output:
-            aggregator.export_to_csv(df, args.output)
+            aggregator.export_to_csv(df, args.output, args.format)
     
     elif args.command == 'stable':
         elements = [e.strip() for e in args.elements.split(',')]
-        df = aggregator.find_stable_materials(
+        fields = _requested_fields(args)
+        columns = aggregator.find_stable_materials_columns(
             elements, 
             energy_above_hull_max=args.hull,
-            band_gap_min=args.band_gap
+            band_gap_min=args.band_gap,
+            properties=fields
         )
+        count = len(next(iter(columns.values()), []))
         
-        print(f"\nFound {len(df)} stable materials containing {', '.join(elements)}:")
-        print(tabulate(df[['material_id', 'formula_pretty', 'formation_energy_per_atom', 
-                         'energy_above_hull', 'band_gap']], 
-                       headers='keys', tablefmt='psql'))
+        print(f"\nFound {count} stable materials containing {', '.join(elements)}:")
+        _print_table(columns, fields)
         
         if args.output:
-            aggregator.export_to_csv(df, args.output)
+            import pandas as pd
+            
+            aggregator.export_to_csv(pd.DataFrame(columns, copy=False), args.output, args.format)
     
     elif args.command == 'summary':
         aggregator.display_material_summary(args.material_id)
+    
+    elif args.command == 'batch':
+        try:
+            with open(args.plan, 'r') as f:
+                tasks = json.load(f)
+        except (OSError, json.JSONDecodeError) as e:
+            print(f"Error: could not read the batch plan {args.plan}: {e}")
+            return
+        
+        if not isinstance(tasks, list) or not all(isinstance(task, dict) for task in tasks):
+            print("Error: the batch plan must be a JSON list of task objects")
+            return
+        
+        results = asyncio.run(_run_batch(aggregator, tasks))
+        
+        for i, (task, result) in enumerate(zip(tasks, results)):
+            if isinstance(result, Exception):
+                print(f"Task {i} ({task.get('command')}) failed: {result}")
+                continue
+            try:
+                aggregator.export_to_csv(
+                    result,
+                    task.get('output') or f"batch_{i}_{task.get('command')}.{task.get('format') or 'csv'}",
+                    task.get('format')
+                )
+            except Exception as e:
+                print(f"Task {i} ({task.get('command')}) export failed: {e}")
 
 
 if __name__ == "__main__":
+    # joblib names its disk cache after the cached function's module, so run
+    # through the importable module to share the cache with library use
+    from materials_aggregator import main
     main()
\ No newline at end of file
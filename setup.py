@@ -14,6 +14,9 @@ setup(
         "numpy>=1.20.0",
         "scipy>=1.7.0",
         "plotly>=5.3.0",
+        "joblib>=1.1.0",
+        "pyarrow>=7.0.0",
+        "python-dotenv>=0.19.0",
     ],
     entry_points={
         'console_scripts': [